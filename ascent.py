@@ -0,0 +1,205 @@
+import numpy as np
+
+# Constants (SI units)
+EARTH_RADIUS = 6371000  # m
+STANDARD_GRAVITY = 9.80665  # m/s^2
+SEA_LEVEL_DENSITY = 1.225  # kg/m^3
+SCALE_HEIGHT = 8500  # m
+
+# Default vehicle configuration
+INITIAL_WEIGHT = 500000  # kg
+INITIAL_FUEL_WEIGHT = 300000  # kg
+THRUST = 12000000  # N
+SPECIFIC_IMPULSE = 450  # s
+DRAG_COEFFICIENT = 0.3
+REFERENCE_AREA = 10.5  # m^2
+PITCH_ANGLE = 0  # degrees from vertical at liftoff
+FINAL_PITCH_ANGLE = 30  # degrees from vertical at burnout
+
+# State columns: downrange position, altitude, horizontal velocity, vertical velocity, mass
+X, H, VX, VH, MASS = range(5)
+STATE_SIZE = 5
+
+MIN_STEP = 1e-6  # s
+
+# Dormand-Prince 5(4) coefficients
+DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]
+]
+DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DP_E = DP_B - np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+# Build a batch of vehicle configurations
+# Every argument may be a scalar or an array; all are broadcast to a common batch size
+# The pitch program tilts the thrust linearly from pitch to final_pitch as the fuel is burned
+def vehicle_parameters(weight=INITIAL_WEIGHT, fuel_weight=INITIAL_FUEL_WEIGHT, thrust=THRUST,
+                       isp=SPECIFIC_IMPULSE, drag_coefficient=DRAG_COEFFICIENT, area=REFERENCE_AREA,
+                       pitch=PITCH_ANGLE, final_pitch=FINAL_PITCH_ANGLE, wind_speed=0, wind_deg=0):
+    (weight, fuel_weight, thrust, isp, drag_coefficient, area, pitch, final_pitch, wind_speed,
+     wind_deg) = np.broadcast_arrays(
+        *[np.atleast_1d(np.asarray(v, dtype=np.float64))
+          for v in (weight, fuel_weight, thrust, isp, drag_coefficient, area, pitch, final_pitch, wind_speed,
+                    wind_deg)])
+    if np.any(weight <= 0):
+        raise ValueError('Vehicle weight must be positive')
+    if np.any(weight - fuel_weight <= 0):
+        raise ValueError('Fuel weight must be less than the vehicle weight')
+    if np.any(isp <= 0):
+        raise ValueError('Specific impulse must be positive')
+    return {
+        'weight': weight,
+        'dry_weight': weight - fuel_weight,
+        'fuel_weight': fuel_weight,
+        'thrust': thrust,
+        'mass_flow': thrust / (isp * STANDARD_GRAVITY),
+        'drag_area': 0.5 * drag_coefficient * area,
+        'pitch': np.radians(pitch),
+        'final_pitch': np.radians(final_pitch),
+        'wind_x': wind_speed * np.cos(np.radians(wind_deg))  # downrange wind component, m/s
+    }
+
+
+# Initial state array (count, STATE_SIZE): vehicles at rest on the pad
+def initial_state(params):
+    state = np.zeros((params['weight'].shape[0], STATE_SIZE))
+    state[:, MASS] = params['weight']
+    return state
+
+
+# Time derivative of the batched state: thrust, mass flow, gravity and drag
+# burning overrides the engine state, so a step ending exactly at burnout keeps thrust on throughout
+def ascent_derivatives(state, params, burning=None):
+    h = np.maximum(state[:, H], 0)
+    vx, vh, mass = state[:, VX], state[:, VH], state[:, MASS]
+
+    # Engines shut down once the fuel is exhausted
+    if burning is None:
+        burning = mass > params['dry_weight']
+    thrust = np.where(burning, params['thrust'], 0)
+    mass_flow = np.where(burning, params['mass_flow'], 0)
+
+    # Pitch program driven by the fraction of fuel burned
+    burned = np.clip(1 - (mass - params['dry_weight']) / params['fuel_weight'], 0, 1)
+    pitch = params['pitch'] + (params['final_pitch'] - params['pitch']) * burned
+
+    # Drag acts against the velocity relative to the (wind-carried) air
+    air_vx = vx - params['wind_x']
+    airspeed = np.sqrt(air_vx ** 2 + vh ** 2)
+    density = SEA_LEVEL_DENSITY * np.exp(-h / SCALE_HEIGHT)
+    drag = density * params['drag_area'] * airspeed
+
+    gravity = STANDARD_GRAVITY * (EARTH_RADIUS / (EARTH_RADIUS + h)) ** 2
+
+    derivatives = np.empty_like(state)
+    derivatives[:, X] = vx
+    derivatives[:, H] = vh
+    derivatives[:, VX] = (thrust * np.sin(pitch) - drag * air_vx) / mass
+    derivatives[:, VH] = (thrust * np.cos(pitch) - drag * vh) / mass - gravity
+
+    # Held down on the pad until thrust exceeds weight
+    on_pad = (state[:, H] <= 0) & (derivatives[:, VH] < 0)
+    derivatives[on_pad, VX] = 0
+    derivatives[on_pad, VH] = 0
+    derivatives[:, MASS] = -mass_flow
+    return derivatives
+
+
+# Integrate a batch of vehicles with an adaptive Dormand-Prince step per vehicle
+# Returns an array (len(output_times), count, STATE_SIZE) sampled at output_times (seconds, ascending)
+def integrate_ascent(state, params, output_times, rtol=1e-6, atol=1e-3, initial_step=0.1, max_step=10.0):
+    output_times = np.asarray(output_times, dtype=np.float64)
+    state = np.array(state, dtype=np.float64)
+    count = state.shape[0]
+    outputs = np.empty((len(output_times), count, STATE_SIZE))
+
+    t = np.zeros(count)
+    dt = np.full(count, initial_step)
+    next_output = np.zeros(count, dtype=np.int64)
+
+    # Record any output times at t = 0
+    while True:
+        pending = next_output < len(output_times)
+        at_output = pending & (output_times[np.minimum(next_output, len(output_times) - 1)] <= t)
+        if not at_output.any():
+            break
+        outputs[next_output[at_output], np.nonzero(at_output)[0]] = state[at_output]
+        next_output[at_output] += 1
+
+    while (next_output < len(output_times)).any():
+        active = np.nonzero(next_output < len(output_times))[0]
+        y = state[active]
+        sub_params = {name: value[active] for name, value in params.items()}
+
+        # Land exactly on the next output time
+        target = output_times[next_output[active]]
+        h = np.minimum(np.minimum(dt[active], max_step), target - t[active])
+
+        # End the step exactly at engine burnout; mass flow is constant, so the burnout time is known
+        burning = y[:, MASS] > sub_params['dry_weight']
+        with np.errstate(divide='ignore'):
+            burn_left = np.where(burning, (y[:, MASS] - sub_params['dry_weight']) / sub_params['mass_flow'], np.inf)
+        at_burnout = burning & (burn_left <= h)
+        h = np.where(at_burnout, burn_left, h)
+
+        # Dormand-Prince stages, with the engine state held fixed across the step
+        k = [ascent_derivatives(y, sub_params, burning)]
+        for stage in range(1, 7):
+            y_stage = y + h[:, None] * sum(a * k[j] for j, a in enumerate(DP_A[stage]) if a)
+            k.append(ascent_derivatives(y_stage, sub_params, burning))
+        y_new = y + h[:, None] * sum(b * k[j] for j, b in enumerate(DP_B) if b)
+        error = h[:, None] * sum(e * k[j] for j, e in enumerate(DP_E) if e)
+
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        error_norm = np.max(np.abs(error) / scale, axis=1)
+        if not np.all(np.isfinite(error_norm)):
+            failed = active[~np.isfinite(error_norm)]
+            raise ValueError(f'Ascent integration diverged for vehicles {failed.tolist()}')
+        accepted = error_norm <= 1
+        stalled = ~accepted & (h <= MIN_STEP)
+        if stalled.any():
+            raise ValueError(f'Ascent integration step size underflow for vehicles {active[stalled].tolist()}')
+
+        # Accept or reject each vehicle's step independently
+        accepted_idx = active[accepted]
+        state[accepted_idx] = y_new[accepted]
+        state[accepted_idx, MASS] = np.maximum(state[accepted_idx, MASS], params['dry_weight'][accepted_idx])
+        burned_out = active[accepted & at_burnout]
+        state[burned_out, MASS] = params['dry_weight'][burned_out]
+
+        # Vehicles that fall back to the ground stay there
+        landed = accepted_idx[(state[accepted_idx, H] <= 0) & (state[accepted_idx, VH] < 0)]
+        state[landed, H] = 0
+        state[landed, VX] = 0
+        state[landed, VH] = 0
+        t[accepted_idx] += h[accepted]
+
+        factor = np.clip(0.9 * np.maximum(error_norm, 1e-10) ** -0.2, 0.2, 5.0)
+        dt[active] = np.clip(np.where(accepted, np.maximum(dt[active], h), h) * factor, MIN_STEP, max_step)
+
+        reached = accepted & (t[active] >= target - 1e-9)
+        reached_idx = active[reached]
+        outputs[next_output[reached_idx], reached_idx] = state[reached_idx]
+        next_output[reached_idx] += 1
+
+    return outputs
+
+
+# Convenience wrapper for a single vehicle sampled at fixed intervals
+# Returns per-sample speed (km/s), downrange distance (km), altitude (km), total weight (kg) and fuel weight (kg)
+def simulate_ascent(duration, interval, **configuration):
+    params = vehicle_parameters(**configuration)
+    times = np.arange(duration) * interval
+    states = integrate_ascent(initial_state(params), params, times)[:, 0]
+    speeds = np.sqrt(states[:, VX] ** 2 + states[:, VH] ** 2) / 1000
+    downranges = states[:, X] / 1000
+    altitudes = states[:, H] / 1000
+    weights = states[:, MASS]
+    fuel_weights = np.maximum(weights - params['dry_weight'][0], 0)
+    return speeds, downranges, altitudes, weights, fuel_weights
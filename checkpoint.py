@@ -0,0 +1,110 @@
+import os
+import tempfile
+
+import numpy as np
+
+# Checkpoint format version
+CHECKPOINT_VERSION = 2
+
+# Key prefixes used inside the .npz archive
+OBJECT_PREFIX = 'object/'
+VEHICLE_PREFIX = 'vehicle/'
+HISTORY_PREFIX = 'history/'
+INPUT_PREFIX = 'input/'
+
+
+# Write arrays to an .npz file atomically
+# The archive is written to a temporary file next to path and swapped in, so an interrupted
+# write never leaves a truncated file behind
+def atomic_savez(path, arrays, compressed=False):
+    fd, temp_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # Uncompressed archives store each column as a raw .npy member, so loading is a straight read
+            if compressed:
+                np.savez_compressed(f, **arrays)
+            else:
+                np.savez(f, **arrays)
+        # mkstemp creates the file owner-only; give it the mode a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+# Capture the state of the global NumPy random generator as plain arrays
+def get_rng_state():
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return {
+        'rng/name': np.array(name),
+        'rng/keys': np.asarray(keys, dtype=np.uint32),
+        'rng/pos': np.array(pos, dtype=np.int64),
+        'rng/has_gauss': np.array(has_gauss, dtype=np.int64),
+        'rng/cached_gaussian': np.array(cached_gaussian, dtype=np.float64)
+    }
+
+
+# Restore the global NumPy random generator from arrays written by get_rng_state
+def set_rng_state(data):
+    np.random.set_state((
+        str(data['rng/name']),
+        np.asarray(data['rng/keys'], dtype=np.uint32),
+        int(data['rng/pos']),
+        int(data['rng/has_gauss']),
+        float(data['rng/cached_gaussian'])
+    ))
+
+
+# Save the full simulation state to a single .npz file
+#   objects: dict of column name -> array (debris/satellite columns)
+#   vehicle: dict of scalar vehicle state (velocity, weight, fuel weight, ...)
+#   history: dict of per-frame lists recorded so far (positions, velocities, ...)
+#   inputs: dict of scalar run inputs needed to reproduce the run (launch wind, ...)
+def save_checkpoint(path, step, objects=None, vehicle=None, history=None, inputs=None, compressed=False):
+    arrays = {
+        'version': np.array(CHECKPOINT_VERSION, dtype=np.int64),
+        'step': np.array(step, dtype=np.int64)
+    }
+    arrays.update(get_rng_state())
+    for name, column in (objects or {}).items():
+        arrays[OBJECT_PREFIX + name] = np.asarray(column)
+    for name, value in (vehicle or {}).items():
+        arrays[VEHICLE_PREFIX + name] = np.asarray(value, dtype=np.float64)
+    for name, values in (history or {}).items():
+        arrays[HISTORY_PREFIX + name] = np.asarray(values, dtype=np.float64)
+    for name, value in (inputs or {}).items():
+        arrays[INPUT_PREFIX + name] = np.asarray(value, dtype=np.float64)
+
+    atomic_savez(path, arrays, compressed)
+
+
+# Load a checkpoint written by save_checkpoint
+# Returns (step, objects, vehicle, history, inputs); the global RNG is restored unless restore_rng is False
+def load_checkpoint(path, restore_rng=True):
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data['version'])
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version {version} in {path}')
+
+        step = int(data['step'])
+        objects = {}
+        vehicle = {}
+        history = {}
+        inputs = {}
+        for key in data.files:
+            if key.startswith(OBJECT_PREFIX):
+                objects[key[len(OBJECT_PREFIX):]] = data[key]
+            elif key.startswith(VEHICLE_PREFIX):
+                vehicle[key[len(VEHICLE_PREFIX):]] = float(data[key])
+            elif key.startswith(HISTORY_PREFIX):
+                history[key[len(HISTORY_PREFIX):]] = data[key].tolist()
+            elif key.startswith(INPUT_PREFIX):
+                inputs[key[len(INPUT_PREFIX):]] = float(data[key])
+
+        if restore_rng:
+            set_rng_state(data)
+
+    return step, objects, vehicle, history, inputs
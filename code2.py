@@ -1,6 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+import glob
+import os
+from conjunction_index import (new_conjunction_log, record_collisions, save_conjunction_chunk,
+                               build_conjunction_index, save_conjunction_index, most_threatened_objects)
 
 # Define constants
 EARTH_RADIUS = 6371  # in km
@@ -9,6 +13,9 @@ TIME_INTERVAL = 60  # 1 minute in seconds
 SIMULATION_DURATION = 600  # in seconds
 DEBRIS_COUNT = 200  # Increased number of debris
 COLLISION_THRESHOLD = 100  # in km
+CONJUNCTION_INDEX_FILE = 'conjunction_index.npz'
+CONJUNCTION_CHUNK_FILE = 'conjunction_events_{:05d}.npz'  # new events flushed during the run
+INDEX_FLUSH_INTERVAL = 3  # screened frames between conjunction event flushes
 
 # Generate random debris data
 def generate_debris_data(count):
@@ -59,6 +66,37 @@ def refactor_satellites(satellite_positions, collisions):
 debris_radii, debris_angles = generate_debris_data(DEBRIS_COUNT)
 satellite_radii, satellite_angles = generate_satellite_data(DEBRIS_COUNT)
 
+# Conjunction history, filled as a by-product of screening
+conjunction_log = new_conjunction_log()
+screened_frames = set()
+flushed_events = 0
+chunk_count = 0
+index_saved = False
+
+# Chunks left by an earlier interrupted run (merge them with load_conjunction_chunks before re-running)
+for stale_chunk in glob.glob(CONJUNCTION_CHUNK_FILE.replace('{:05d}', '*')):
+    os.remove(stale_chunk)
+
+# Write only the events recorded since the last flush, so a killed run keeps its history on disk
+def flush_conjunction_events():
+    global flushed_events, chunk_count
+    if len(conjunction_log['time']) > flushed_events:
+        flushed_events = save_conjunction_chunk(CONJUNCTION_CHUNK_FILE.format(chunk_count), conjunction_log,
+                                                flushed_events)
+        chunk_count += 1
+
+# Build the conjunction index once at the end of the run; it supersedes the flushed chunks
+def save_conjunction_history():
+    global index_saved
+    if index_saved:
+        return None
+    index_saved = True
+    conjunction_index = build_conjunction_index(conjunction_log)
+    save_conjunction_index(CONJUNCTION_INDEX_FILE, conjunction_index)
+    for i in range(chunk_count):
+        os.remove(CONJUNCTION_CHUNK_FILE.format(i))
+    return conjunction_index
+
 # Function to update plot
 def update(frame):
     # Update debris positions
@@ -69,6 +107,16 @@ def update(frame):
     collisions = detect_collisions(satellite_positions, debris_positions)
     # Print collisions
     print(f"Frame: {frame}, Collisions: {collisions}")
+    # Record conjunctions (the first frame may be drawn twice by FuncAnimation)
+    if frame not in screened_frames:
+        screened_frames.add(frame)
+        record_collisions(conjunction_log, frame, collisions, satellite_positions, debris_positions)
+        # Periodically flush new events, and build the index after the last frame
+        if frame == frames[-1]:
+            conjunction_index = save_conjunction_history()
+            print(f"Most threatened objects: {most_threatened_objects(conjunction_index, count=5)}")
+        elif len(screened_frames) % INDEX_FLUSH_INTERVAL == 0:
+            flush_conjunction_events()
     # Refactor satellites
     refactor_satellites(satellite_positions, collisions)
     # Clear previous plot
@@ -99,5 +147,8 @@ def update(frame):
 
 # Create animation
 fig, ax = plt.subplots()
-ani = FuncAnimation(fig, update, frames=np.arange(0, SIMULATION_DURATION, TIME_INTERVAL), interval=50, repeat=False)
+# Build the index if the window is closed before the last frame (no-op once it has been built)
+fig.canvas.mpl_connect('close_event', lambda event: save_conjunction_history())
+frames = np.arange(0, SIMULATION_DURATION, TIME_INTERVAL)
+ani = FuncAnimation(fig, update, frames=frames, interval=50, repeat=False)
 plt.show()
@@ -2,6 +2,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import requests
+import os
+from ascent import simulate_ascent
+from checkpoint import save_checkpoint, load_checkpoint
 from datetime import datetime
 
 # Constants
@@ -18,6 +21,9 @@ INITIAL_FUEL_WEIGHT = 300000  # kg
 DEBRIS_COUNT = 200  # Number of debris
 SATELLITE_COUNT = 50  # Number of existing satellites
 COLLISION_THRESHOLD = 100  # in km
+CHECKPOINT_FILE = 'code3_checkpoint.npz'
+CHECKPOINT_INTERVAL = 60  # frames between checkpoints
+RESUME_FROM_CHECKPOINT = False  # Resume from CHECKPOINT_FILE if it exists
 
 # API key for OpenWeather (replace with your own API key)
 API_KEY = 'your_openweather_api_key'
@@ -54,35 +60,14 @@ def get_weather_data(lat, lon):
         }
 
 
-# Calculate launch trajectory
-def calculate_trajectory(simulation_time):
-    trajectory = []
-    for t in range(simulation_time):
-        if t < simulation_time / 3:
-            altitude = EARTH_RADIUS + (t / (simulation_time / 3)) * TARGET_ORBIT_ALTITUDE / 2
-            x = 0
-            y = altitude
-        elif t < 2 * simulation_time / 3:
-            u = t - simulation_time / 3
-            v = simulation_time / 3
-            altitude = EARTH_RADIUS + TARGET_ORBIT_ALTITUDE / 2 + (u / v) * TARGET_ORBIT_ALTITUDE / 2
-            x = (u / v) * TARGET_ORBIT_ALTITUDE / 2
-            y = altitude
-        else:
-            u = t - 2 * simulation_time / 3
-            v = simulation_time / 3
-            x = (u / v) * TARGET_ORBIT_ALTITUDE / 2 + TARGET_ORBIT_ALTITUDE / 2
-            y = EARTH_RADIUS + TARGET_ORBIT_ALTITUDE
-        trajectory.append((x, y))
-    return trajectory
-
-
-trajectory = calculate_trajectory(SIMULATION_DURATION)
-
 # Generate debris and satellite data
 debris_radii, debris_angles = generate_object_data(DEBRIS_COUNT, TARGET_ORBIT_ALTITUDE)
 satellite_radii, satellite_angles = generate_object_data(SATELLITE_COUNT, TARGET_ORBIT_ALTITUDE + 100)
 
+# Launch-site wind driving the integrated ascent
+launch_weather = get_weather_data(LAUNCH_LAT, LAUNCH_LON)
+launch_wind = {'wind_speed': launch_weather['wind_speed'], 'wind_deg': launch_weather['wind_deg']}
+
 # Initialize data lists
 positions = []
 velocities = []
@@ -93,6 +78,49 @@ weights = []
 current_velocity = INITIAL_VELOCITY
 current_weight = INITIAL_WEIGHT
 current_fuel_weight = INITIAL_FUEL_WEIGHT
+start_frame = 0
+recorded_frames = set()
+
+
+# Save the current simulation state so the run can be resumed later
+def save_simulation_state(step):
+    save_checkpoint(CHECKPOINT_FILE, step,
+                    objects={
+                        'debris_radii': debris_radii,
+                        'debris_angles': debris_angles,
+                        'satellite_radii': satellite_radii,
+                        'satellite_angles': satellite_angles
+                    },
+                    vehicle={
+                        'velocity': current_velocity,
+                        'weight': current_weight,
+                        'fuel_weight': current_fuel_weight
+                    },
+                    history={
+                        'positions': positions,
+                        'velocities': velocities,
+                        'fuel_weights': fuel_weights,
+                        'weights': weights
+                    },
+                    inputs=launch_wind)
+
+
+# Resume from a previous checkpoint
+if RESUME_FROM_CHECKPOINT and os.path.exists(CHECKPOINT_FILE):
+    start_frame, objects, vehicle, history, launch_wind = load_checkpoint(CHECKPOINT_FILE)
+    debris_radii = objects['debris_radii']
+    debris_angles = objects['debris_angles']
+    satellite_radii = objects['satellite_radii']
+    satellite_angles = objects['satellite_angles']
+    positions = [tuple(p) for p in history['positions']]
+    velocities = history['velocities']
+    fuel_weights = history['fuel_weights']
+    weights = history['weights']
+
+# Integrate the ascent dynamics once, independent of the animation frame rate
+# The vehicle state is rebuilt from the (saved) launch wind rather than restored frame by frame
+ascent_velocities, ascent_downranges, ascent_altitudes, ascent_weights, ascent_fuel_weights = simulate_ascent(
+    SIMULATION_DURATION, TIME_INTERVAL, weight=INITIAL_WEIGHT, fuel_weight=INITIAL_FUEL_WEIGHT, **launch_wind)
 
 
 # Function to update plot
@@ -103,28 +131,26 @@ def update(frame):
 
     # Get current weather data
     weather_data = get_weather_data(LAUNCH_LAT, LAUNCH_LON)
-    wind_speed = weather_data['wind_speed']
-    wind_deg = weather_data['wind_deg']
 
-    # Adjust launch trajectory for wind
-    wind_adjustment_x = np.cos(np.radians(wind_deg)) * wind_speed * frame / 1000
-    wind_adjustment_y = np.sin(np.radians(wind_deg)) * wind_speed * frame / 1000
+    # Get launch vehicle position from the integrated ascent
+    x, y = ascent_downranges[frame], EARTH_RADIUS + ascent_altitudes[frame]
 
-    # Get launch vehicle position
-    x, y = trajectory[frame]
-    x += wind_adjustment_x
-    y += wind_adjustment_y
+    # Current vehicle state from the integrated ascent
+    current_velocity = ascent_velocities[frame]
+    current_weight = ascent_weights[frame]
+    current_fuel_weight = ascent_fuel_weights[frame]
 
-    # Update lists
-    positions.append((x, y))
-    velocities.append(current_velocity)
-    fuel_weights.append(current_fuel_weight)
-    weights.append(current_weight)
+    # Update lists once per frame (the first frame may be drawn twice by FuncAnimation)
+    if frame not in recorded_frames:
+        recorded_frames.add(frame)
+        positions.append((x, y))
+        velocities.append(current_velocity)
+        fuel_weights.append(current_fuel_weight)
+        weights.append(current_weight)
 
-    # Update current conditions (simplified linear fuel burn and velocity increase)
-    current_fuel_weight -= 0.5  # kg per second
-    current_weight -= 0.5  # kg per second
-    current_velocity += 0.01  # km/s per second
+        # Periodically checkpoint the simulation state
+        if (frame + 1) % CHECKPOINT_INTERVAL == 0:
+            save_simulation_state(frame + 1)
 
     # Plot Earth
     earth = plt.Circle((0, 0), EARTH_RADIUS, color='blue', alpha=0.3)
@@ -158,6 +184,7 @@ def update(frame):
             f'Fuel Density: {FUEL_DENSITY} kg/L\n'
             f'Fuel Weight: {current_fuel_weight:.2f} kg\n'
             f'Fuel Left: {current_fuel_weight:.2f} kg\n'
+            f'Fuel Volume: {current_fuel_weight / FUEL_DENSITY:.2f} L\n'
             f'Time: {frame * TIME_INTERVAL}s',
             fontsize=10)
 
@@ -175,5 +202,5 @@ def update(frame):
 
 # Create animation
 fig, ax = plt.subplots()
-ani = FuncAnimation(fig, update, frames=SIMULATION_DURATION, interval=TIME_INTERVAL * 1000 / 60, repeat=False)
+ani = FuncAnimation(fig, update, frames=range(start_frame, SIMULATION_DURATION), interval=TIME_INTERVAL * 1000 / 60, repeat=False)
 plt.show()
@@ -3,6 +3,9 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from mpl_toolkits.mplot3d import Axes3D
 import requests
+import os
+from ascent import simulate_ascent
+from checkpoint import save_checkpoint, load_checkpoint
 
 # Constants
 EARTH_RADIUS = 6371  # km
@@ -18,6 +21,9 @@ INITIAL_FUEL_WEIGHT = 300000  # kg
 DEBRIS_COUNT = 200  # Number of debris
 SATELLITE_COUNT = 50  # Number of existing satellites
 COLLISION_THRESHOLD = 100  # in km
+CHECKPOINT_FILE = 'code4_checkpoint.npz'
+CHECKPOINT_INTERVAL = 60  # frames between checkpoints
+RESUME_FROM_CHECKPOINT = False  # Resume from CHECKPOINT_FILE if it exists
 
 # API key for OpenWeather (replace with your own API key)
 API_KEY = 'your_openweather_api_key'
@@ -65,33 +71,15 @@ def lat_lon_alt_to_cartesian(lat, lon, alt):
     return x, y, z
 
 
-# Calculate launch trajectory
-def calculate_trajectory(simulation_time):
-    trajectory = []
-    for t in range(simulation_time):
-        if t < simulation_time / 3:
-            altitude = (t / (simulation_time / 3)) * TARGET_ORBIT_ALTITUDE / 2
-        elif t < 2 * simulation_time / 3:
-            u = t - simulation_time / 3
-            v = simulation_time / 3
-            altitude = TARGET_ORBIT_ALTITUDE / 2 + (u / v) * TARGET_ORBIT_ALTITUDE / 2
-        else:
-            u = t - 2 * simulation_time / 3
-            v = simulation_time / 3
-            altitude = TARGET_ORBIT_ALTITUDE + (u / v) * TARGET_ORBIT_ALTITUDE / 2
-        trajectory.append(altitude)
-    return trajectory
-
-
-trajectory_altitudes = calculate_trajectory(SIMULATION_DURATION)
-trajectory_latitudes = np.linspace(LAUNCH_LAT, LAUNCH_LAT, SIMULATION_DURATION)
-trajectory_longitudes = np.linspace(LAUNCH_LON, LAUNCH_LON, SIMULATION_DURATION)
-
 # Generate debris and satellite data
 debris_latitudes, debris_longitudes, debris_altitudes = generate_object_data(DEBRIS_COUNT, TARGET_ORBIT_ALTITUDE)
 satellite_latitudes, satellite_longitudes, satellite_altitudes = generate_object_data(SATELLITE_COUNT,
                                                                                       TARGET_ORBIT_ALTITUDE + 100)
 
+# Launch-site wind driving the integrated ascent
+launch_weather = get_weather_data(LAUNCH_LAT, LAUNCH_LON)
+launch_wind = {'wind_speed': launch_weather['wind_speed'], 'wind_deg': launch_weather['wind_deg']}
+
 # Initialize data lists
 positions = []
 velocities = []
@@ -102,6 +90,53 @@ weights = []
 current_velocity = INITIAL_VELOCITY
 current_weight = INITIAL_WEIGHT
 current_fuel_weight = INITIAL_FUEL_WEIGHT
+start_frame = 0
+recorded_frames = set()
+
+
+# Save the current simulation state so the run can be resumed later
+def save_simulation_state(step):
+    save_checkpoint(CHECKPOINT_FILE, step,
+                    objects={
+                        'debris_latitudes': debris_latitudes,
+                        'debris_longitudes': debris_longitudes,
+                        'debris_altitudes': debris_altitudes,
+                        'satellite_latitudes': satellite_latitudes,
+                        'satellite_longitudes': satellite_longitudes,
+                        'satellite_altitudes': satellite_altitudes
+                    },
+                    vehicle={
+                        'velocity': current_velocity,
+                        'weight': current_weight,
+                        'fuel_weight': current_fuel_weight
+                    },
+                    history={
+                        'positions': positions,
+                        'velocities': velocities,
+                        'fuel_weights': fuel_weights,
+                        'weights': weights
+                    },
+                    inputs=launch_wind)
+
+
+# Resume from a previous checkpoint
+if RESUME_FROM_CHECKPOINT and os.path.exists(CHECKPOINT_FILE):
+    start_frame, objects, vehicle, history, launch_wind = load_checkpoint(CHECKPOINT_FILE)
+    debris_latitudes = objects['debris_latitudes']
+    debris_longitudes = objects['debris_longitudes']
+    debris_altitudes = objects['debris_altitudes']
+    satellite_latitudes = objects['satellite_latitudes']
+    satellite_longitudes = objects['satellite_longitudes']
+    satellite_altitudes = objects['satellite_altitudes']
+    positions = [tuple(p) for p in history['positions']]
+    velocities = history['velocities']
+    fuel_weights = history['fuel_weights']
+    weights = history['weights']
+
+# Integrate the ascent dynamics once, independent of the animation frame rate
+# The vehicle state is rebuilt from the (saved) launch wind rather than restored frame by frame
+ascent_velocities, ascent_downranges, ascent_altitudes, ascent_weights, ascent_fuel_weights = simulate_ascent(
+    SIMULATION_DURATION, TIME_INTERVAL, weight=INITIAL_WEIGHT, fuel_weight=INITIAL_FUEL_WEIGHT, **launch_wind)
 
 
 # Function to update plot
@@ -112,27 +147,29 @@ def update(frame):
 
     # Get current weather data
     weather_data = get_weather_data(LAUNCH_LAT, LAUNCH_LON)
-    wind_speed = weather_data['wind_speed']
-    wind_deg = weather_data['wind_deg']
 
-    # Adjust launch trajectory for wind
-    wind_adjustment = np.cos(np.radians(wind_deg)) * wind_speed * frame / 1000
-
-    # Get launch vehicle position
-    lat, lon, alt = trajectory_latitudes[frame], trajectory_longitudes[frame], trajectory_altitudes[
-        frame] + wind_adjustment
+    # Get launch vehicle position from the integrated ascent
+    lat = LAUNCH_LAT
+    lon = LAUNCH_LON + np.degrees(ascent_downranges[frame] / (EARTH_RADIUS * np.cos(np.radians(LAUNCH_LAT))))
+    alt = ascent_altitudes[frame]
     x, y, z = lat_lon_alt_to_cartesian(lat, lon, alt)
 
-    # Update lists
-    positions.append((x, y, z))
-    velocities.append(current_velocity)
-    fuel_weights.append(current_fuel_weight)
-    weights.append(current_weight)
+    # Current vehicle state from the integrated ascent
+    current_velocity = ascent_velocities[frame]
+    current_weight = ascent_weights[frame]
+    current_fuel_weight = ascent_fuel_weights[frame]
+
+    # Update lists once per frame (the first frame may be drawn twice by FuncAnimation)
+    if frame not in recorded_frames:
+        recorded_frames.add(frame)
+        positions.append((x, y, z))
+        velocities.append(current_velocity)
+        fuel_weights.append(current_fuel_weight)
+        weights.append(current_weight)
 
-    # Update current conditions (simplified linear fuel burn and velocity increase)
-    current_fuel_weight -= 0.5  # kg per second
-    current_weight -= 0.5  # kg per second
-    current_velocity += 0.01  # km/s per second
+        # Periodically checkpoint the simulation state
+        if (frame + 1) % CHECKPOINT_INTERVAL == 0:
+            save_simulation_state(frame + 1)
 
     # Convert debris and satellite positions to Cartesian coordinates
     debris_x, debris_y, debris_z = lat_lon_alt_to_cartesian(debris_latitudes, debris_longitudes, debris_altitudes)
@@ -163,6 +200,7 @@ def update(frame):
                           f'Fuel Density: {FUEL_DENSITY} kg/L\n'
                           f'Fuel Weight: {current_fuel_weight:.2f} kg\n'
                           f'Fuel Left: {current_fuel_weight:.2f} kg\n'
+                          f'Fuel Volume: {current_fuel_weight / FUEL_DENSITY:.2f} L\n'
                           f'Time: {frame * TIME_INTERVAL}s',
               transform=ax.transAxes, fontsize=10)
 
@@ -180,5 +218,5 @@ def update(frame):
 # Create animation
 fig = plt.figure()
 ax = fig.add_subplot(111, projection='3d')
-ani = FuncAnimation(fig, update, frames=SIMULATION_DURATION, interval=TIME_INTERVAL * 1000 / 60, repeat=False)
+ani = FuncAnimation(fig, update, frames=range(start_frame, SIMULATION_DURATION), interval=TIME_INTERVAL * 1000 / 60, repeat=False)
 plt.show()
@@ -2,6 +2,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import requests
+import os
+from ascent import simulate_ascent
+from checkpoint import save_checkpoint, load_checkpoint
 
 # Constants
 EARTH_RADIUS = 6371  # km
@@ -14,6 +17,9 @@ INITIAL_VELOCITY = 0  # km/s
 INITIAL_WEIGHT = 500000  # kg
 FUEL_DENSITY = 0.8  # kg/L
 INITIAL_FUEL_WEIGHT = 300000  # kg
+CHECKPOINT_FILE = 'code5_checkpoint.npz'
+CHECKPOINT_INTERVAL = 60  # frames between checkpoints
+RESUME_FROM_CHECKPOINT = False  # Resume from CHECKPOINT_FILE if it exists
 
 # API key for OpenWeather (replace with your own API key)
 API_KEY = 'your_openweather_api_key'
@@ -43,27 +49,9 @@ def get_weather_data(lat, lon):
         }
 
 
-# Calculate launch trajectory
-def calculate_trajectory(simulation_time):
-    trajectory = []
-    for t in range(simulation_time):
-        if t < simulation_time / 3:
-            altitude = (t / (simulation_time / 3)) * TARGET_ORBIT_ALTITUDE / 2
-        elif t < 2 * simulation_time / 3:
-            u = t - simulation_time / 3
-            v = simulation_time / 3
-            altitude = TARGET_ORBIT_ALTITUDE / 2 + (u / v) * TARGET_ORBIT_ALTITUDE / 2
-        else:
-            u = t - 2 * simulation_time / 3
-            v = simulation_time / 3
-            altitude = TARGET_ORBIT_ALTITUDE + (u / v) * TARGET_ORBIT_ALTITUDE / 2
-        trajectory.append(altitude)
-    return trajectory
-
-
-trajectory_altitudes = calculate_trajectory(SIMULATION_DURATION)
-trajectory_latitudes = np.linspace(LAUNCH_LAT, LAUNCH_LAT, SIMULATION_DURATION)
-trajectory_longitudes = np.linspace(LAUNCH_LON, LAUNCH_LON, SIMULATION_DURATION)
+# Launch-site wind driving the integrated ascent
+launch_weather = get_weather_data(LAUNCH_LAT, LAUNCH_LON)
+launch_wind = {'wind_speed': launch_weather['wind_speed'], 'wind_deg': launch_weather['wind_deg']}
 
 # Initialize data lists
 positions = []
@@ -75,6 +63,39 @@ weights = []
 current_velocity = INITIAL_VELOCITY
 current_weight = INITIAL_WEIGHT
 current_fuel_weight = INITIAL_FUEL_WEIGHT
+start_frame = 0
+recorded_frames = set()
+
+
+# Save the current simulation state so the run can be resumed later
+def save_simulation_state(step):
+    save_checkpoint(CHECKPOINT_FILE, step,
+                    vehicle={
+                        'velocity': current_velocity,
+                        'weight': current_weight,
+                        'fuel_weight': current_fuel_weight
+                    },
+                    history={
+                        'positions': positions,
+                        'velocities': velocities,
+                        'fuel_weights': fuel_weights,
+                        'weights': weights
+                    },
+                    inputs=launch_wind)
+
+
+# Resume from a previous checkpoint
+if RESUME_FROM_CHECKPOINT and os.path.exists(CHECKPOINT_FILE):
+    start_frame, objects, vehicle, history, launch_wind = load_checkpoint(CHECKPOINT_FILE)
+    positions = [tuple(p) for p in history['positions']]
+    velocities = history['velocities']
+    fuel_weights = history['fuel_weights']
+    weights = history['weights']
+
+# Integrate the ascent dynamics once, independent of the animation frame rate
+# The vehicle state is rebuilt from the (saved) launch wind rather than restored frame by frame
+ascent_velocities, ascent_downranges, ascent_altitudes, ascent_weights, ascent_fuel_weights = simulate_ascent(
+    SIMULATION_DURATION, TIME_INTERVAL, weight=INITIAL_WEIGHT, fuel_weight=INITIAL_FUEL_WEIGHT, **launch_wind)
 
 
 # Function to update plot
@@ -85,27 +106,26 @@ def update(frame):
 
     # Get current weather data
     weather_data = get_weather_data(LAUNCH_LAT, LAUNCH_LON)
-    wind_speed = weather_data['wind_speed']
-    wind_deg = weather_data['wind_deg']
 
-    # Adjust launch trajectory for wind
-    wind_adjustment = np.cos(np.radians(wind_deg)) * wind_speed * frame / 1000
+    # Get launch vehicle position from the integrated ascent
+    x, y = ascent_downranges[frame], ascent_altitudes[frame]
 
-    # Get launch vehicle position
-    lat, lon, alt = trajectory_latitudes[frame], trajectory_longitudes[frame], trajectory_altitudes[
-        frame] + wind_adjustment
-    x, y = alt * np.cos(np.radians(lat)), alt * np.sin(np.radians(lat))
+    # Current vehicle state from the integrated ascent
+    current_velocity = ascent_velocities[frame]
+    current_weight = ascent_weights[frame]
+    current_fuel_weight = ascent_fuel_weights[frame]
 
-    # Update lists
-    positions.append((x, y))
-    velocities.append(current_velocity)
-    fuel_weights.append(current_fuel_weight)
-    weights.append(current_weight)
+    # Update lists once per frame (the first frame may be drawn twice by FuncAnimation)
+    if frame not in recorded_frames:
+        recorded_frames.add(frame)
+        positions.append((x, y))
+        velocities.append(current_velocity)
+        fuel_weights.append(current_fuel_weight)
+        weights.append(current_weight)
 
-    # Update current conditions (simplified linear fuel burn and velocity increase)
-    current_fuel_weight -= 0.5  # kg per second
-    current_weight -= 0.5  # kg per second
-    current_velocity += 0.01  # km/s per second
+        # Periodically checkpoint the simulation state
+        if (frame + 1) % CHECKPOINT_INTERVAL == 0:
+            save_simulation_state(frame + 1)
 
     # Plot trajectory
     positions_x, positions_y = zip(*positions)
@@ -125,6 +145,7 @@ def update(frame):
                         f'Fuel Density: {FUEL_DENSITY} kg/L\n'
                         f'Fuel Weight: {current_fuel_weight:.2f} kg\n'
                         f'Fuel Left: {current_fuel_weight:.2f} kg\n'
+                        f'Fuel Volume: {current_fuel_weight / FUEL_DENSITY:.2f} L\n'
                         f'Time: {frame * TIME_INTERVAL}s',
             transform=ax.transAxes, fontsize=10)
 
@@ -141,5 +162,5 @@ def update(frame):
 
 # Create animation
 fig, ax = plt.subplots()
-ani = FuncAnimation(fig, update, frames=SIMULATION_DURATION, interval=TIME_INTERVAL * 1000 / 60, repeat=False)
+ani = FuncAnimation(fig, update, frames=range(start_frame, SIMULATION_DURATION), interval=TIME_INTERVAL * 1000 / 60, repeat=False)
 plt.show()
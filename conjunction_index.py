@@ -0,0 +1,174 @@
+import numpy as np
+
+from checkpoint import atomic_savez
+
+# Object types that can take part in a conjunction
+OBJECT_TYPES = ('satellite', 'debris')
+TIME_BUCKET = 3600  # seconds per time bucket
+
+# Column types of a conjunction log
+LOG_DTYPES = {'object': np.int64, 'other': np.int64, 'time': np.float64, 'distance': np.float64}
+
+
+# Encode an object (type, index) as a single integer key
+def object_key(obj_type, obj_idx):
+    return (OBJECT_TYPES.index(obj_type) << 32) | int(obj_idx)
+
+
+# Decode an integer key back into (type, index)
+def decode_object_key(key):
+    return OBJECT_TYPES[int(key) >> 32], int(key) & 0xFFFFFFFF
+
+
+# Start an empty log of conjunction events, filled while screening
+def new_conjunction_log():
+    return {'object': [], 'other': [], 'time': [], 'distance': []}
+
+
+# Record one conjunction; the event is stored once under each participant
+def record_conjunction(log, time, obj1_type, obj1_idx, obj2_type, obj2_idx, distance):
+    key1 = object_key(obj1_type, obj1_idx)
+    key2 = object_key(obj2_type, obj2_idx)
+    log['object'] += [key1, key2]
+    log['other'] += [key2, key1]
+    log['time'] += [time, time]
+    log['distance'] += [distance, distance]
+
+
+# Record the output of detect_collisions for one screening step
+# Pairs reported in both orders (satellite i/k and k/i) are only recorded once
+def record_collisions(log, time, collisions, satellite_positions, debris_positions):
+    positions = {'satellite': satellite_positions, 'debris': debris_positions}
+    for obj1_type, obj1_idx, obj2_type, obj2_idx in collisions:
+        if obj1_type == obj2_type and obj1_idx > obj2_idx:
+            continue
+        pos1 = positions[obj1_type][obj1_idx]
+        pos2 = positions[obj2_type][obj2_idx]
+        distance = np.sqrt((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2)
+        record_conjunction(log, time, obj1_type, obj1_idx, obj2_type, obj2_idx, distance)
+
+
+# Save the events recorded from position start onwards as a separate chunk file
+# Flushing only new events keeps periodic saves proportional to the events since the last flush
+# Returns the number of events flushed so far, to pass as start for the next chunk
+def save_conjunction_chunk(path, log, start):
+    atomic_savez(path, {name: np.asarray(log[name][start:], dtype=dtype) for name, dtype in LOG_DTYPES.items()})
+    return len(log['time'])
+
+
+# Merge chunk files written by save_conjunction_chunk back into a single log
+def load_conjunction_chunks(paths):
+    log = {name: [np.empty(0, dtype=dtype)] for name, dtype in LOG_DTYPES.items()}
+    for path in paths:
+        with np.load(path, allow_pickle=False) as data:
+            for name in LOG_DTYPES:
+                log[name].append(data[name])
+    return {name: np.concatenate(columns) for name, columns in log.items()}
+
+
+# Build a CSR-style index from a conjunction log
+#   objects[i]                       -> key of the i-th object row
+#   bucket_ptr[i]:bucket_ptr[i + 1]  -> that object's time buckets in buckets / event_ptr
+#   event_ptr[b]:event_ptr[b + 1]    -> events of bucket b, sorted by time
+#   bucket_min_distance[b]           -> closest approach within bucket b
+def build_conjunction_index(log, bucket_size=TIME_BUCKET):
+    obj = np.asarray(log['object'], dtype=np.int64)
+    other = np.asarray(log['other'], dtype=np.int64)
+    time = np.asarray(log['time'], dtype=np.float64)
+    distance = np.asarray(log['distance'], dtype=np.float64)
+
+    order = np.lexsort((time, obj))
+    obj, other, time, distance = obj[order], other[order], time[order], distance[order]
+    bucket = np.floor_divide(time, bucket_size).astype(np.int64)
+
+    # One entry per distinct (object, bucket) pair
+    new_bucket = np.ones(len(obj), dtype=bool)
+    new_bucket[1:] = (obj[1:] != obj[:-1]) | (bucket[1:] != bucket[:-1])
+    bucket_starts = np.nonzero(new_bucket)[0]
+    bucket_objects = obj[bucket_starts]
+
+    # One row per distinct object
+    new_object = np.ones(len(bucket_starts), dtype=bool)
+    new_object[1:] = bucket_objects[1:] != bucket_objects[:-1]
+    object_starts = np.nonzero(new_object)[0]
+
+    return {
+        'bucket_size': np.array(bucket_size, dtype=np.float64),
+        'objects': bucket_objects[object_starts],
+        'bucket_ptr': np.append(object_starts, len(bucket_starts)),
+        'buckets': bucket[bucket_starts],
+        'bucket_min_distance': np.minimum.reduceat(distance, bucket_starts) if len(distance) else np.empty(0),
+        'event_ptr': np.append(bucket_starts, len(obj)),
+        'other': other,
+        'time': time,
+        'distance': distance
+    }
+
+
+# Save an index to an uncompressed .npz file; an interrupted save keeps the previous index
+def save_conjunction_index(path, index):
+    atomic_savez(path, index)
+
+
+# Load an index written by save_conjunction_index
+def load_conjunction_index(path):
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+# Event range [start, stop) of one object within [t_start, t_end)
+# Also returns the range [first_bucket, last_bucket) of buckets holding those events
+def _event_range(index, key, t_start, t_end):
+    row = np.searchsorted(index['objects'], key)
+    if row == len(index['objects']) or index['objects'][row] != key:
+        return 0, 0, 0, 0
+
+    # Binary search over the object's buckets, then over the events of the boundary buckets
+    first, last = index['bucket_ptr'][row], index['bucket_ptr'][row + 1]
+    buckets = index['buckets'][first:last]
+    event_ptr = index['event_ptr']
+    times = index['time']
+    bucket_size = float(index['bucket_size'])
+
+    first_bucket = first + np.searchsorted(buckets, np.floor(t_start / bucket_size), side='left')
+    start = event_ptr[first_bucket]
+    if first_bucket < last:
+        start += np.searchsorted(times[event_ptr[first_bucket]:event_ptr[first_bucket + 1]], t_start, side='left')
+
+    b = first + np.searchsorted(buckets, np.floor(t_end / bucket_size), side='left')
+    stop = event_ptr[b]
+    if b < last:
+        stop += np.searchsorted(times[event_ptr[b]:event_ptr[b + 1]], t_end, side='left')
+    return start, stop, first_bucket, min(b + 1, last)
+
+
+# All conjunctions of one object, optionally limited to a time range and a miss-distance cutoff
+# Object and time lookups are binary searches; buckets whose closest approach is not under the
+# cutoff are skipped whole, and the remaining buckets are filtered in O(k) of their events
+# Returns a list of (time, other_type, other_idx, distance) sorted by time
+def query_conjunctions(index, obj_type, obj_idx, t_start=-np.inf, t_end=np.inf, max_distance=np.inf):
+    start, stop, first_bucket, last_bucket = _event_range(index, object_key(obj_type, obj_idx), t_start, t_end)
+    event_ptr = index['event_ptr']
+    buckets = np.arange(first_bucket, last_bucket)
+    buckets = buckets[index['bucket_min_distance'][buckets] < max_distance]
+    events = np.concatenate([np.arange(0)] + [np.arange(max(event_ptr[b], start), min(event_ptr[b + 1], stop))
+                                              for b in buckets])
+    events = events[index['distance'][events] < max_distance]
+    return [(float(t), *decode_object_key(o), float(d))
+            for t, o, d in zip(index['time'][events], index['other'][events], index['distance'][events])]
+
+
+# Objects with the most conjunctions, optionally counting only those closer than max_distance
+# Returns a list of (obj_type, obj_idx, count, closest_distance), most threatened first
+def most_threatened_objects(index, count=10, max_distance=np.inf):
+    event_rows = np.repeat(np.arange(len(index['objects'])), np.diff(index['bucket_ptr']))
+    event_rows = np.repeat(event_rows, np.diff(index['event_ptr']))
+    close = index['distance'] < max_distance
+
+    counts = np.bincount(event_rows[close], minlength=len(index['objects']))
+    closest = np.full(len(index['objects']), np.inf)
+    np.minimum.at(closest, event_rows[close], index['distance'][close])
+
+    ranked = np.lexsort((closest, -counts))[:count]
+    return [(*decode_object_key(index['objects'][i]), int(counts[i]), float(closest[i]))
+            for i in ranked if counts[i] > 0]